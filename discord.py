@@ -1,19 +1,12 @@
-const { Client, GatewayIntentBits, EmbedBuilder, PermissionFlagsBits, ChannelType, ActionRowBuilder, ButtonBuilder, ButtonStyle } = require('discord.js');
+const { Client, GatewayIntentBits, EmbedBuilder, PermissionFlagsBits, ChannelType, ActionRowBuilder, ButtonBuilder, ButtonStyle, RESTJSONErrorCodes } = require('discord.js');
+const { Worker } = require('worker_threads');
+const { monitorEventLoopDelay } = require('perf_hooks');
+const os = require('os');
+const fs = require('fs');
+const path = require('path');
+const inspector = require('inspector');
 require('dotenv').config();
 
-const client = new Client({ 
-  intents: [
-    GatewayIntentBits.Guilds, 
-    GatewayIntentBits.GuildMessages, 
-    GatewayIntentBits.MessageContent,
-    GatewayIntentBits.GuildMembers,
-    GatewayIntentBits.GuildModeration
-  ] 
-});
-
-// Increase max listeners to prevent warning (we have many command handlers)
-client.setMaxListeners(20);
-
 // ============ CONFIGURATION ============
 const CONFIG = {
   COMMAND_PREFIX: process.env.COMMAND_PREFIX || '!', // Command prefix (e.g., '!', 'tc!', '?')
@@ -22,11 +15,630 @@ const CONFIG = {
   LOG_CHANNEL_NAME: 'mod-logs', // Moderation log channel
   TICKET_CATEGORY_NAME: 'Support Tickets', // Category for tickets
   DEFAULT_NICKNAME_FORMAT: (username) => `${CONFIG.AUTO_NICKNAME_PREFIX} ${username}`,
+  WORKER_POOL_SIZE: parseInt(process.env.WORKER_POOL_SIZE) || Math.max(1, Math.min(4, os.cpus().length - 1)), // Worker threads for CPU-heavy tasks
+  WORKER_QUEUE_LIMIT: 256, // Queued tasks before callers have to wait for a free slot
+  WORKER_RESTART_LIMIT: 5, // Worker crashes per minute before the pool gives up and runs tasks inline
+  PROFILE_DIR: process.env.PROFILE_DIR || path.join(__dirname, 'profiles'), // Where !profile writes captures
+  PROFILE_MAX_SECONDS: 60, // Longest CPU profile !profile will record
+  PURGE_MAX_COUNT: 5000, // Most messages a single !purge may delete
+  PURGE_SCAN_LIMIT: 10000, // Most messages a single !purge will look through
+  DATA_DIR: process.env.DATA_DIR || path.join(__dirname, 'data'), // Persistent bot state
+  WARNING_EXPIRY_DAYS: parseInt(process.env.WARNING_EXPIRY_DAYS) || 30, // Warnings decay after this many days
+  SCHEDULER_BATCH_SIZE: 500, // Due tasks fired together per timer tick
+  GATEWAY_COMPRESSION: process.env.GATEWAY_COMPRESSION || 'zlib-stream', // 'zlib-stream' or 'none'
+  GATEWAY_ENCODING: process.env.GATEWAY_ENCODING || 'json', // 'json' or 'etf'
+  GATEWAY_CAPTURE: process.env.GATEWAY_CAPTURE === 'true', // Record gateway payloads for !gateway bench
+  GATEWAY_CAPTURE_LIMIT: 5000, // Payloads recorded per run
+  INFO_CACHE_TTL: 30 * 1000, // How long rendered !serverinfo / !userinfo embeds are reused
+  INFO_CACHE_MAX_ENTRIES: 1000, // Rendered embeds kept before the oldest are dropped
+  REST_BUCKET_CONCURRENCY: 1, // Requests per route bucket released from the non-moderation lanes at once
+  REST_KEEP_ALIVE_MS: 60 * 1000, // How long idle HTTP connections to Discord stay open
 };
 
+// ============ GATEWAY TRANSPORT ============
+function optionalRequire(name) {
+  try {
+    return require(name);
+  } catch (error) {
+    return null;
+  }
+}
+
+// Picks the requested compression/encoding when the modules behind them are
+// installed, and falls back to uncompressed JSON otherwise
+function resolveGatewayTransport() {
+  const ws = optionalRequire('@discordjs/ws');
+  const transport = { options: {}, compression: null, encoding: ws?.Encoding?.JSON, notes: [] };
+
+  if (CONFIG.GATEWAY_COMPRESSION === 'zlib-stream') {
+    const methods = ws?.CompressionMethod || {};
+    if (optionalRequire('zlib-sync') && (methods.ZlibSync ?? methods.ZlibStream) !== undefined) {
+      transport.compression = methods.ZlibSync ?? methods.ZlibStream;
+    } else if (methods.ZlibNative !== undefined) {
+      transport.compression = methods.ZlibNative;
+    } else {
+      transport.notes.push('zlib-stream needs zlib-sync or a newer @discordjs/ws');
+    }
+  }
+
+  if (CONFIG.GATEWAY_ENCODING === 'etf') {
+    if (ws?.Encoding?.ETF !== undefined && optionalRequire('erlpack')) {
+      transport.encoding = ws.Encoding.ETF;
+    } else {
+      transport.notes.push('ETF needs erlpack and an @discordjs/ws build with ETF support');
+    }
+  }
+
+  // discord.js builds the @discordjs/ws options from a fixed set of ws keys and
+  // picks compression itself, so plain ws.compression/ws.encoding are ignored.
+  // buildStrategy is passed through and receives the manager before any shard
+  // connects, which makes it the one place the choice can be applied.
+  if (ws?.SimpleShardingStrategy) {
+    transport.options.buildStrategy = (manager) => {
+      manager.options.compression = transport.compression;
+      if (transport.encoding !== undefined) manager.options.encoding = transport.encoding;
+      return new ws.SimpleShardingStrategy(manager);
+    };
+  } else {
+    transport.notes.push('@discordjs/ws not found, discord.js defaults are used');
+  }
+
+  return transport;
+}
+
+// Reads the mode back from the gateway manager discord.js actually created
+function describeGatewayTransport() {
+  const options = client.ws._ws?.options;
+  if (!options) {
+    return { compression: 'unknown', encoding: 'unknown' };
+  }
+  const methods = optionalRequire('@discordjs/ws')?.CompressionMethod || {};
+  const method = Object.keys(methods).find(name => methods[name] === options.compression);
+  return {
+    compression: options.compression == null ? 'none' : `zlib-stream (${method || options.compression})`,
+    encoding: options.encoding || 'json',
+  };
+}
+
+const gatewayTransport = resolveGatewayTransport();
+
+// ============ REST CONNECTION POOL ============
+// Keep HTTPS connections to Discord open between calls instead of reconnecting
+function createRestAgent() {
+  const undici = optionalRequire('undici');
+  if (!undici) return null;
+  return new undici.Agent({
+    connect: { timeout: 30000 },
+    keepAliveTimeout: CONFIG.REST_KEEP_ALIVE_MS,
+    keepAliveMaxTimeout: CONFIG.REST_KEEP_ALIVE_MS,
+  });
+}
+
+const restAgent = createRestAgent();
+
+const client = new Client({ 
+  intents: [
+    GatewayIntentBits.Guilds, 
+    GatewayIntentBits.GuildMessages, 
+    GatewayIntentBits.MessageContent,
+    GatewayIntentBits.GuildMembers,
+    GatewayIntentBits.GuildModeration,
+    GatewayIntentBits.GuildEmojisAndStickers
+  ],
+  ws: gatewayTransport.options,
+  rest: restAgent ? { agent: restAgent } : {}
+});
+
+// Increase max listeners to prevent warning (we have many command handlers)
+client.setMaxListeners(25);
+
 // ============ DATA STORAGE ============
 const warnings = new Map(); // userId -> [{ moderator, reason, timestamp }]
 const activeTickets = new Map(); // channelId -> { userId, reason, timestamp }
+const rateLimitResets = new Map(); // `${majorParameter}:${route}` -> timestamp when the bucket resets
+
+// Event loop delay (ns histogram), reported by !ping
+const eventLoopDelay = monitorEventLoopDelay({ resolution: 10 });
+eventLoopDelay.enable();
+
+// ============ WORKER POOL ============
+// Tasks that run off the main event loop. Each function is copied into the
+// workers as source, so it must be pure and only use its own payload.
+const WORKER_TASKS = {
+  summarizeCpuProfile({ profile, limit }) {
+    // Self time per function, from how often each node was the sampled leaf.
+    // V8's pseudo-nodes are reported apart so idle time doesn't top the list.
+    const overheadNodes = { '(idle)': 'idle', '(program)': 'program', '(garbage collector)': 'gc' };
+    const interval = (profile.endTime - profile.startTime) / Math.max(1, profile.samples.length);
+    const hits = new Map();
+    for (const id of profile.samples) hits.set(id, (hits.get(id) || 0) + 1);
+    const totals = new Map();
+    const overheadMs = { idle: 0, program: 0, gc: 0 };
+    for (const node of profile.nodes) {
+      const count = hits.get(node.id);
+      if (!count) continue;
+      const { functionName, url, lineNumber } = node.callFrame;
+      if (!url && overheadNodes[functionName]) {
+        overheadMs[overheadNodes[functionName]] += count * interval / 1000;
+        continue;
+      }
+      const key = `${functionName || '(anonymous)'} ${url ? `${url.split('/').pop()}:${lineNumber + 1}` : ''}`.trim();
+      totals.set(key, (totals.get(key) || 0) + count * interval);
+    }
+    const functions = [...totals]
+      .sort((a, b) => b[1] - a[1])
+      .slice(0, limit)
+      .map(([name, micros]) => ({ name, ms: micros / 1000 }));
+    return { functions, overheadMs };
+  },
+
+  async summarizeHeapSnapshot({ file, limit }) {
+    // Shallow size per constructor, like the Summary view in DevTools. The
+    // snapshot is scanned as a stream so only the running totals stay in
+    // memory: {"snapshot":{"meta":...},"nodes":[...],...,"strings":[...]}
+    const fs = require('fs');
+    let section = 'header'; // header -> nodes -> seekStrings -> strings -> done
+    let buffered = '';
+    let fields, types, typeIndex, nameIndex, sizeIndex;
+    const values = [];
+    let value = 0;
+    let inNumber = false;
+    const totals = new Map(); // '(type)' or name string index -> { count, bytes }
+    const names = new Map(); // string index -> name, for the indices we need
+    let stringIndex = 0;
+    let inString = false;
+    let escaped = false;
+    let token = null;
+
+    for await (const chunk of fs.createReadStream(file, { encoding: 'utf8', highWaterMark: 1 << 20 })) {
+      let text = chunk;
+
+      if (section === 'header') {
+        buffered += text;
+        const start = buffered.indexOf('"nodes":[');
+        if (start === -1) continue;
+        const meta = JSON.parse(`${buffered.slice(0, buffered.lastIndexOf(',', start))}}`).snapshot.meta;
+        fields = meta.node_fields;
+        types = meta.node_types[0];
+        typeIndex = fields.indexOf('type');
+        nameIndex = fields.indexOf('name');
+        sizeIndex = fields.indexOf('self_size');
+        text = buffered.slice(start + 9);
+        buffered = '';
+        section = 'nodes';
+      }
+
+      if (section === 'nodes') {
+        let i = 0;
+        for (; i < text.length; i++) {
+          const code = text.charCodeAt(i);
+          if (code >= 48 && code <= 57) {
+            value = value * 10 + (code - 48);
+            inNumber = true;
+            continue;
+          }
+          if (inNumber) {
+            values.push(value);
+            value = 0;
+            inNumber = false;
+            if (values.length === fields.length) {
+              const type = types[values[typeIndex]];
+              const key = type === 'object' || type === 'native' ? values[nameIndex] : `(${type})`;
+              if (typeof key === 'number') names.set(key, null);
+              const entry = totals.get(key) || { count: 0, bytes: 0 };
+              entry.count++;
+              entry.bytes += values[sizeIndex];
+              totals.set(key, entry);
+              values.length = 0;
+            }
+          }
+          if (code === 93) break; // ']'
+        }
+        if (i === text.length) continue;
+        text = text.slice(i + 1);
+        section = 'seekStrings';
+      }
+
+      if (section === 'seekStrings') {
+        buffered += text;
+        const start = buffered.indexOf('"strings":[');
+        if (start === -1) {
+          buffered = buffered.slice(-16);
+          continue;
+        }
+        text = buffered.slice(start + 11);
+        buffered = '';
+        section = 'strings';
+      }
+
+      if (section === 'strings') {
+        for (let i = 0; i < text.length; i++) {
+          const ch = text[i];
+          if (!inString) {
+            if (ch === '"') {
+              inString = true;
+              token = names.has(stringIndex) ? '"' : null;
+            } else if (ch === ']') {
+              section = 'done';
+              break;
+            }
+            continue;
+          }
+          if (escaped) {
+            escaped = false;
+          } else if (ch === '\\') {
+            escaped = true;
+          } else if (ch === '"') {
+            inString = false;
+            if (token !== null) names.set(stringIndex, JSON.parse(`${token}"`));
+            stringIndex++;
+            continue;
+          }
+          if (token !== null) token += ch;
+        }
+      }
+
+      if (section === 'done') break;
+    }
+
+    return [...totals]
+      .sort((a, b) => b[1].bytes - a[1].bytes)
+      .slice(0, limit)
+      .map(([key, { count, bytes }]) => ({ name: typeof key === 'number' ? names.get(key) ?? '(unknown)' : key, count, bytes }));
+  },
+
+  async benchGatewayPayloads({ file }) {
+    // Replays captured payloads through each transport and measures bytes and decode time
+    const fs = require('fs');
+    const zlib = require('zlib');
+    const payloads = fs.readFileSync(file, 'utf8').split('\n').filter(Boolean);
+    const elapsed = (start) => Number(process.hrtime.bigint() - start) / 1e6;
+    const results = [];
+
+    let start = process.hrtime.bigint();
+    for (const payload of payloads) JSON.parse(payload);
+    results.push({ mode: 'json', bytes: payloads.reduce((total, payload) => total + Buffer.byteLength(payload), 0), decodeMs: elapsed(start) });
+
+    // zlib-stream keeps one compression context for the whole session and
+    // flushes after every payload, so run each frame through a shared stream
+    const pump = (stream, input) => new Promise((resolve, reject) => {
+      const chunks = [];
+      const onData = chunk => chunks.push(chunk);
+      stream.on('data', onData);
+      stream.write(input);
+      stream.flush(zlib.constants.Z_SYNC_FLUSH, error => {
+        stream.off('data', onData);
+        if (error) reject(error);
+        else resolve(Buffer.concat(chunks));
+      });
+    });
+    const deflate = zlib.createDeflate();
+    const frames = [];
+    for (const payload of payloads) frames.push(await pump(deflate, payload));
+    const zlibBytes = frames.reduce((total, frame) => total + frame.length, 0);
+
+    // Decode synchronously so only inflate + parse is timed, the way the
+    // gateway does it: zlib-sync when installed, else one inflateSync pass
+    let ZlibSync = null;
+    try {
+      ZlibSync = require('zlib-sync');
+    } catch (error) {
+      // Fall back to Node's zlib below
+    }
+    if (ZlibSync) {
+      const inflate = new ZlibSync.Inflate({ chunkSize: 65535 });
+      start = process.hrtime.bigint();
+      for (const frame of frames) {
+        inflate.push(frame, ZlibSync.Z_SYNC_FLUSH);
+        if (inflate.err) throw new Error(`zlib-sync inflate failed: ${inflate.msg}`);
+        JSON.parse(inflate.result.toString());
+      }
+      results.push({ mode: 'json + zlib-stream (zlib-sync)', bytes: zlibBytes, decodeMs: elapsed(start) });
+    } else {
+      const lengths = payloads.map(payload => Buffer.byteLength(payload));
+      const stream = Buffer.concat(frames);
+      start = process.hrtime.bigint();
+      const inflated = zlib.inflateSync(stream, { finishFlush: zlib.constants.Z_SYNC_FLUSH });
+      let offset = 0;
+      for (const length of lengths) {
+        JSON.parse(inflated.toString('utf8', offset, offset + length));
+        offset += length;
+      }
+      results.push({ mode: 'json + zlib-stream (node zlib)', bytes: zlibBytes, decodeMs: elapsed(start) });
+    }
+
+    let erlpack = null;
+    try {
+      erlpack = require('erlpack');
+    } catch (error) {
+      // ETF is only measured when erlpack is installed
+    }
+    if (erlpack) {
+      const packed = payloads.map(payload => erlpack.pack(JSON.parse(payload)));
+      start = process.hrtime.bigint();
+      for (const frame of packed) erlpack.unpack(frame);
+      results.push({ mode: 'etf', bytes: packed.reduce((total, frame) => total + frame.length, 0), decodeMs: elapsed(start) });
+    }
+
+    return { payloads: payloads.length, results };
+  },
+};
+
+// Payloads travel as UTF-8 buffers whose memory is transferred, not copied
+const WORKER_SOURCE = `
+const { parentPort } = require('worker_threads');
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+const TASKS = {
+${Object.values(WORKER_TASKS).map(task => task.toString()).join(',\n')}
+};
+parentPort.on('message', async ({ id, type, buffer }) => {
+  try {
+    const result = encoder.encode(JSON.stringify(await TASKS[type](JSON.parse(decoder.decode(buffer)))));
+    parentPort.postMessage({ id, buffer: result }, [result.buffer]);
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
+`;
+
+const workerPool = {
+  workers: [],
+  idle: [],
+  queue: [], // [{ id, type, buffer }]
+  pending: new Map(), // taskId -> { resolve, reject, worker }
+  capacityWaiters: [],
+  restarts: [], // Timestamps of recent worker crashes
+  nextId: 1,
+  disabled: false,
+};
+
+const textEncoder = new TextEncoder();
+const textDecoder = new TextDecoder();
+
+function spawnWorker() {
+  const worker = new Worker(WORKER_SOURCE, { eval: true });
+
+  worker.on('message', ({ id, buffer, error }) => {
+    const task = workerPool.pending.get(id);
+    workerPool.pending.delete(id);
+    if (task) {
+      if (error) task.reject(new Error(error));
+      else task.resolve(JSON.parse(textDecoder.decode(buffer)));
+    }
+    workerPool.idle.push(worker);
+    dispatchWorkerTasks();
+  });
+
+  worker.on('error', error => console.error('Worker thread error:', error));
+
+  worker.on('exit', code => {
+    // Fail whatever the dead worker was running and replace it
+    for (const [id, task] of workerPool.pending) {
+      if (task.worker === worker) {
+        workerPool.pending.delete(id);
+        task.reject(new Error(`Worker exited with code ${code}`));
+      }
+    }
+    workerPool.workers = workerPool.workers.filter(w => w !== worker);
+    workerPool.idle = workerPool.idle.filter(w => w !== worker);
+
+    // Workers that keep dying (bad source, resource limits) aren't respawned forever
+    const now = Date.now();
+    workerPool.restarts = workerPool.restarts.filter(time => now - time < 60 * 1000);
+    workerPool.restarts.push(now);
+    if (workerPool.restarts.length > CONFIG.WORKER_RESTART_LIMIT) {
+      if (!workerPool.workers.length) {
+        disableWorkerPool(`workers crashed ${workerPool.restarts.length} times in a minute`);
+      }
+      return;
+    }
+
+    if (workerPool.workers.length < CONFIG.WORKER_POOL_SIZE) {
+      try {
+        workerPool.workers.push(spawnWorker());
+      } catch (error) {
+        if (!workerPool.workers.length) disableWorkerPool(error.message);
+        return;
+      }
+      dispatchWorkerTasks();
+    }
+  });
+
+  workerPool.idle.push(worker);
+  return worker;
+}
+
+function startWorkerPool() {
+  try {
+    while (workerPool.workers.length < CONFIG.WORKER_POOL_SIZE) {
+      workerPool.workers.push(spawnWorker());
+    }
+    console.log(`🧵 Worker pool started with ${workerPool.workers.length} threads`);
+  } catch (error) {
+    disableWorkerPool(error.message);
+  }
+}
+
+// Falls back to running tasks on the main thread, including any still queued
+function disableWorkerPool(reason) {
+  console.error(`Worker pool disabled, running tasks inline: ${reason}`);
+  workerPool.disabled = true;
+  for (const { id, type, buffer } of workerPool.queue.splice(0)) {
+    const task = workerPool.pending.get(id);
+    workerPool.pending.delete(id);
+    Promise.resolve()
+      .then(() => WORKER_TASKS[type](JSON.parse(textDecoder.decode(buffer))))
+      .then(task.resolve, task.reject);
+  }
+  for (const wake of workerPool.capacityWaiters.splice(0)) wake();
+}
+
+function dispatchWorkerTasks() {
+  while (workerPool.idle.length && workerPool.queue.length) {
+    const worker = workerPool.idle.shift();
+    const { id, type, buffer } = workerPool.queue.shift();
+    workerPool.pending.get(id).worker = worker;
+    worker.postMessage({ id, type, buffer }, [buffer.buffer]);
+  }
+  // Let waiting callers in now that the queue has room again
+  while (workerPool.capacityWaiters.length && workerPool.queue.length < CONFIG.WORKER_QUEUE_LIMIT) {
+    workerPool.capacityWaiters.shift()();
+  }
+}
+
+async function runTask(type, payload) {
+  if (!WORKER_TASKS[type]) {
+    throw new Error(`Unknown worker task: ${type}`);
+  }
+  if (!workerPool.workers.length && !workerPool.disabled) {
+    startWorkerPool();
+  }
+
+  // Backpressure: wait for queue space instead of growing it without bound
+  while (!workerPool.disabled && workerPool.queue.length >= CONFIG.WORKER_QUEUE_LIMIT) {
+    await new Promise(resolve => workerPool.capacityWaiters.push(resolve));
+  }
+  if (workerPool.disabled) {
+    return WORKER_TASKS[type](payload);
+  }
+
+  const id = workerPool.nextId++;
+  const buffer = textEncoder.encode(JSON.stringify(payload));
+  return new Promise((resolve, reject) => {
+    workerPool.pending.set(id, { resolve, reject, worker: null });
+    workerPool.queue.push({ id, type, buffer });
+    dispatchWorkerTasks();
+  });
+}
+
+// ============ REST PRIORITY LANES ============
+// Outbound REST calls are queued per lane and released by weighted fair
+// queuing. Each route bucket gets only a few requests in flight at once, so
+// a burst of bulk or log traffic can't pile up inside discord.js's queue
+// for that bucket. Moderation is never held back by this layer.
+const REST_LANES = {
+  moderation: { weight: 8, uncapped: true }, // kicks, bans, timeouts, unbans
+  replies: { weight: 4 }, // command confirmations and progress messages
+  logs: { weight: 2 }, // mod-log and join/leave embeds
+  bulk: { weight: 1 }, // nickname/role jobs, join-wave cosmetics, old-message deletes
+};
+
+const LANE_SCAN_DEPTH = 50; // Queued requests looked at per lane when the head's bucket is busy
+
+const restScheduler = {
+  virtualTime: 0,
+  inFlight: 0,
+  bucketsInFlight: new Map(), // bucket -> requests in flight
+  retryTimer: null,
+};
+
+for (const lane of Object.values(REST_LANES)) {
+  lane.queue = []; // [{ fn, bucket, finish, start, enqueuedAt, resolve, reject }]
+  lane.lastFinish = 0;
+  lane.inFlight = 0;
+  lane.completed = 0;
+  lane.waits = []; // Most recent queue waits in ms
+}
+
+// Same `${majorParameter}:${route}` key the rateLimited listener records
+function restBucket(majorParameter, route) {
+  return `${majorParameter}:${route}`;
+}
+
+function laneRequest(laneName, fn, bucket = laneName) {
+  const lane = REST_LANES[laneName];
+  return new Promise((resolve, reject) => {
+    const start = Math.max(restScheduler.virtualTime, lane.lastFinish);
+    lane.lastFinish = start + 1 / lane.weight;
+    lane.queue.push({ fn, bucket, start, finish: lane.lastFinish, enqueuedAt: Date.now(), resolve, reject });
+    dispatchLaneRequests();
+  });
+}
+
+function dispatchLaneRequests() {
+  while (true) {
+    // Smallest finish tag among each lane's first request whose bucket has a
+    // free slot and isn't rate limited
+    const now = Date.now();
+    let next = null;
+    let nextLane = null;
+    let nextIndex = -1;
+    let earliestReset = Infinity;
+    for (const lane of Object.values(REST_LANES)) {
+      const depth = Math.min(lane.queue.length, LANE_SCAN_DEPTH);
+      for (let i = 0; i < depth; i++) {
+        const request = lane.queue[i];
+        if (!lane.uncapped) {
+          if ((restScheduler.bucketsInFlight.get(request.bucket) || 0) >= CONFIG.REST_BUCKET_CONCURRENCY) continue;
+          const resetAt = rateLimitResets.get(request.bucket);
+          if (resetAt > now) {
+            earliestReset = Math.min(earliestReset, resetAt);
+            continue;
+          }
+          if (resetAt) rateLimitResets.delete(request.bucket);
+        }
+        if (!next || request.finish < next.finish) {
+          next = request;
+          nextLane = lane;
+          nextIndex = i;
+        }
+        break;
+      }
+    }
+
+    if (!next) {
+      // Everything waiting is behind a rate limit or a busy bucket; busy buckets
+      // dispatch again when their request finishes, rate limits when they reset
+      if (earliestReset !== Infinity && !restScheduler.retryTimer) {
+        restScheduler.retryTimer = setTimeout(() => {
+          restScheduler.retryTimer = null;
+          dispatchLaneRequests();
+        }, earliestReset - now);
+      }
+      return;
+    }
+
+    nextLane.queue.splice(nextIndex, 1);
+    restScheduler.virtualTime = next.start;
+    restScheduler.inFlight++;
+    restScheduler.bucketsInFlight.set(next.bucket, (restScheduler.bucketsInFlight.get(next.bucket) || 0) + 1);
+    nextLane.inFlight++;
+    nextLane.waits.push(now - next.enqueuedAt);
+    if (nextLane.waits.length > 500) nextLane.waits.shift();
+
+    const { bucket } = next;
+    const lane = nextLane;
+    Promise.resolve()
+      .then(next.fn)
+      .then(next.resolve, next.reject)
+      .finally(() => {
+        restScheduler.inFlight--;
+        const remaining = restScheduler.bucketsInFlight.get(bucket) - 1;
+        if (remaining > 0) restScheduler.bucketsInFlight.set(bucket, remaining);
+        else restScheduler.bucketsInFlight.delete(bucket);
+        lane.inFlight--;
+        lane.completed++;
+        dispatchLaneRequests();
+      });
+  }
+}
+
+function getLaneStats() {
+  const percentile = (sorted, p) => sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))] : 0;
+  return Object.entries(REST_LANES).map(([name, lane]) => {
+    const sorted = [...lane.waits].sort((a, b) => a - b);
+    return {
+      name,
+      queued: lane.queue.length,
+      inFlight: lane.inFlight,
+      completed: lane.completed,
+      p50: percentile(sorted, 0.5),
+      p95: percentile(sorted, 0.95),
+      max: sorted.length ? sorted[sorted.length - 1] : 0,
+    };
+  });
+}
 
 // ============ HELPER FUNCTIONS ============
 async function getLogChannel(guild) {
@@ -112,6 +724,12 @@ async function createSupportTicket(guild, userId, reason, moderatorId) {
   }
 }
 
+// Discord rejects embed field values longer than 1024 characters
+function clipFieldValue(value) {
+  const text = String(value);
+  return text.length > 1024 ? `${text.slice(0, 1021)}...` : text;
+}
+
 async function logModeration(guild, action, target, moderator, reason, extraFields = []) {
   const logChannel = await getLogChannel(guild);
   if (!logChannel) return;
@@ -120,18 +738,229 @@ async function logModeration(guild, action, target, moderator, reason, extraFiel
     .setTitle(`🛡️ Moderation Action: ${action}`)
     .setColor(0xe67e22)
     .addFields(
-      { name: '👤 Target', value: `${target.tag || target.user?.tag} (${target.id})`, inline: true },
-      { name: '👮 Moderator', value: `${moderator.tag} (${moderator.id})`, inline: true },
-      { name: '📝 Reason', value: reason || 'No reason provided', inline: false },
-      ...extraFields
+      { name: '👤 Target', value: clipFieldValue(`${target.tag || target.user?.tag} (${target.id})`), inline: true },
+      { name: '👮 Moderator', value: clipFieldValue(`${moderator.tag} (${moderator.id})`), inline: true },
+      { name: '📝 Reason', value: clipFieldValue(reason || 'No reason provided'), inline: false },
+      ...extraFields.map(field => ({ ...field, value: clipFieldValue(field.value) }))
     )
     .setTimestamp()
     .setFooter({ text: `Action: ${action}` });
 
-  await logChannel.send({ embeds: [embed] });
+  await laneRequest('logs', () => logChannel.send({ embeds: [embed] }), restBucket(logChannel.id, '/channels/:id/messages'));
 }
 
 
+// ============ SCHEDULER ============
+// Durable timers: a binary min-heap ordered by due time, a single Node timer
+// for the earliest task, and an append-only journal replayed on boot.
+const MAX_TIMER_DELAY = 2 ** 31 - 1; // setTimeout overflows past ~24.8 days
+const SCHEDULER_JOURNAL = path.join(CONFIG.DATA_DIR, 'scheduler.jsonl');
+
+const scheduler = {
+  heap: [], // [{ id, type, dueAt, data, attempts }]
+  timer: null,
+  armedFor: Infinity,
+  started: false,
+  journal: null,
+  journalLines: 0,
+  nextId: 1,
+};
+
+const SCHEDULED_HANDLERS = {
+  async deleteChannel({ channelId }) {
+    const channel = await client.channels.fetch(channelId).catch(() => null);
+    if (channel) await channel.delete();
+  },
+
+  async unban({ guildId, userId, reason }) {
+    const guild = client.guilds.cache.get(guildId);
+    if (!guild) return;
+    const user = await client.users.fetch(userId);
+    await laneRequest('moderation', () => guild.members.unban(userId, 'Temporary ban expired'));
+    await logModeration(guild, 'TEMPBAN EXPIRED', user, client.user, reason);
+  },
+
+  async expireWarning({ userId, timestamp }) {
+    const userWarnings = warnings.get(userId);
+    if (!userWarnings) return;
+    const remaining = userWarnings.filter(warn => warn.timestamp !== timestamp);
+    if (remaining.length) warnings.set(userId, remaining);
+    else warnings.delete(userId);
+  },
+};
+
+// How often a failed task is retried: delay doubles per attempt up to maxDelay.
+// An unban that never runs leaves the user banned for good, so it keeps trying
+// for roughly a day before giving up.
+const SCHEDULED_RETRY = {
+  default: { attempts: 3, baseDelay: 60 * 1000, maxDelay: 60 * 1000 },
+  unban: { attempts: 28, baseDelay: 60 * 1000, maxDelay: 60 * 60 * 1000 },
+};
+
+// Called once a task has used up its retries
+const SCHEDULED_FAILURE_HANDLERS = {
+  async unban({ guildId, userId, reason }, error, attempts) {
+    const guild = client.guilds.cache.get(guildId);
+    if (!guild) return;
+    const user = await client.users.fetch(userId).catch(() => ({ tag: 'Unknown user', id: userId }));
+    await logModeration(guild, 'TEMPBAN UNBAN FAILED', user, client.user,
+      `Automatic unban failed after ${attempts} attempts (${error.message}). Please unban manually. Original reason: ${reason || 'No reason provided'}`);
+  },
+};
+
+function heapPush(heap, task) {
+  let i = heap.length;
+  heap.push(task);
+  while (i > 0) {
+    const parent = (i - 1) >> 1;
+    if (heap[parent].dueAt <= task.dueAt) break;
+    heap[i] = heap[parent];
+    i = parent;
+  }
+  heap[i] = task;
+}
+
+function heapPop(heap) {
+  const top = heap[0];
+  const last = heap.pop();
+  if (heap.length) {
+    let i = 0;
+    while (true) {
+      let child = 2 * i + 1;
+      if (child >= heap.length) break;
+      if (child + 1 < heap.length && heap[child + 1].dueAt < heap[child].dueAt) child++;
+      if (heap[child].dueAt >= last.dueAt) break;
+      heap[i] = heap[child];
+      i = child;
+    }
+    heap[i] = last;
+  }
+  return top;
+}
+
+function writeJournal(entry) {
+  scheduler.journal.write(`${JSON.stringify(entry)}\n`);
+  scheduler.journalLines++;
+}
+
+// Rewrite the journal as one line per pending task
+function compactJournal() {
+  if (scheduler.journal) scheduler.journal.end();
+  const tmp = `${SCHEDULER_JOURNAL}.tmp`;
+  fs.writeFileSync(tmp, scheduler.heap.map(task => `${JSON.stringify({ op: 'add', task })}\n`).join(''));
+  fs.renameSync(tmp, SCHEDULER_JOURNAL);
+  scheduler.journal = fs.createWriteStream(SCHEDULER_JOURNAL, { flags: 'a' });
+  scheduler.journalLines = scheduler.heap.length;
+}
+
+function loadScheduler() {
+  fs.mkdirSync(CONFIG.DATA_DIR, { recursive: true });
+  const tasks = new Map();
+  if (fs.existsSync(SCHEDULER_JOURNAL)) {
+    for (const line of fs.readFileSync(SCHEDULER_JOURNAL, 'utf8').split('\n')) {
+      if (!line) continue;
+      try {
+        const entry = JSON.parse(line);
+        if (entry.op === 'add') tasks.set(entry.task.id, entry.task);
+        else if (entry.op === 'done') tasks.delete(entry.id);
+      } catch (error) {
+        // A torn final line from a crash mid-write; everything before it is intact
+        console.log('Skipping unreadable scheduler journal line:', error.message);
+      }
+    }
+  }
+  for (const task of tasks.values()) {
+    heapPush(scheduler.heap, task);
+    scheduler.nextId = Math.max(scheduler.nextId, task.id + 1);
+  }
+  compactJournal();
+  console.log(`⏰ Scheduler loaded ${scheduler.heap.length} pending tasks`);
+}
+
+function armScheduler() {
+  if (!scheduler.started) return;
+  const next = scheduler.heap[0];
+  if (next && next.dueAt === scheduler.armedFor) return;
+  clearTimeout(scheduler.timer);
+  scheduler.timer = null;
+  scheduler.armedFor = Infinity;
+  if (!next) return;
+  scheduler.armedFor = next.dueAt;
+  scheduler.timer = setTimeout(runDueTasks, Math.min(Math.max(0, next.dueAt - Date.now()), MAX_TIMER_DELAY));
+}
+
+async function runDueTasks() {
+  scheduler.timer = null;
+  scheduler.armedFor = Infinity;
+
+  const now = Date.now();
+  const batch = [];
+  while (scheduler.heap.length && scheduler.heap[0].dueAt <= now && batch.length < CONFIG.SCHEDULER_BATCH_SIZE) {
+    batch.push(heapPop(scheduler.heap));
+  }
+
+  const results = await Promise.allSettled(batch.map(task => {
+    const handler = SCHEDULED_HANDLERS[task.type];
+    if (!handler) return Promise.reject(new Error(`Unknown scheduled task type: ${task.type}`));
+    return handler(task.data);
+  }));
+
+  results.forEach((result, index) => {
+    const task = batch[index];
+    const retry = SCHEDULED_RETRY[task.type] || SCHEDULED_RETRY.default;
+    if (result.status === 'rejected' && task.attempts < retry.attempts && SCHEDULED_HANDLERS[task.type]) {
+      // Back off and retry; re-adding under the same id replaces it on replay
+      const delay = Math.min(retry.baseDelay * 2 ** task.attempts, retry.maxDelay);
+      console.log(`Scheduled ${task.type} failed, retrying in ${Math.round(delay / 1000)}s:`, result.reason.message);
+      task.attempts++;
+      task.dueAt = Date.now() + delay;
+      heapPush(scheduler.heap, task);
+      writeJournal({ op: 'add', task });
+      return;
+    }
+    if (result.status === 'rejected') {
+      console.error(`Scheduled ${task.type} failed permanently:`, result.reason);
+      const onFailure = SCHEDULED_FAILURE_HANDLERS[task.type];
+      if (onFailure) {
+        onFailure(task.data, result.reason, task.attempts + 1)
+          .catch(error => console.error(`Failed to report ${task.type} failure:`, error));
+      }
+    }
+    writeJournal({ op: 'done', id: task.id });
+  });
+
+  if (scheduler.journalLines > 2 * scheduler.heap.length + 10000) {
+    compactJournal();
+  }
+  armScheduler();
+}
+
+function scheduleTask(type, delayMs, data) {
+  const task = { id: scheduler.nextId++, type, dueAt: Date.now() + delayMs, data, attempts: 0 };
+  heapPush(scheduler.heap, task);
+  writeJournal({ op: 'add', task });
+  if (task.dueAt < scheduler.armedFor) armScheduler();
+  return task.id;
+}
+
+function startScheduler() {
+  scheduler.started = true;
+  armScheduler();
+}
+
+// Parses durations like 30m, 12h, 7d or 1d12h into milliseconds
+function parseDuration(text) {
+  const units = { s: 1000, m: 60 * 1000, h: 60 * 60 * 1000, d: 24 * 60 * 60 * 1000, w: 7 * 24 * 60 * 60 * 1000 };
+  if (!text || !/^(\d+[smhdw])+$/i.test(text)) return null;
+  let total = 0;
+  for (const [, amount, unit] of text.toLowerCase().matchAll(/(\d+)([smhdw])/g)) {
+    total += parseInt(amount) * units[unit];
+  }
+  return total || null;
+}
+
+loadScheduler();
+
 // ============ HELPER: COMMAND FUNCTIONS ============
 function isCommand(message, command) {
   return message.content === `${CONFIG.COMMAND_PREFIX}${command}` || 
@@ -148,6 +977,11 @@ client.once('clientReady', () => {
   console.log(`✅ Trapo Cloud Bot is online! Logged in as ${client.user.tag}`);
   console.log(`📝 Command Prefix: ${CONFIG.COMMAND_PREFIX}`);
   client.user.setActivity(`Trapo Cloud | ${CONFIG.COMMAND_PREFIX}help`, { type: 'WATCHING' });
+  const transport = describeGatewayTransport();
+  console.log(`📡 Gateway transport: ${transport.compression} compression, ${transport.encoding} encoding` +
+    (gatewayTransport.notes.length ? ` (${gatewayTransport.notes.join('; ')})` : ''));
+  startScheduler();
+  loadBulkJobs().catch(error => console.error('Failed to load bulk jobs:', error));
 });
 
 // ============ EVENT: NEW MEMBER ============
@@ -155,12 +989,14 @@ client.on('guildMemberAdd', async member => {
   try {
     // 1. Set auto nickname
     const newNickname = CONFIG.DEFAULT_NICKNAME_FORMAT(member.user.username);
-    await member.setNickname(newNickname).catch(err => console.log('Cannot set nickname:', err.message));
+    await laneRequest('bulk', () => member.setNickname(newNickname), restBucket(member.guild.id, '/guilds/:id/members/:id'))
+      .catch(err => console.log('Cannot set nickname:', err.message));
 
     // 2. Assign welcome role
     const welcomeRole = member.guild.roles.cache.find(role => role.name === CONFIG.WELCOME_ROLE_NAME);
     if (welcomeRole) {
-      await member.roles.add(welcomeRole).catch(err => console.log('Cannot assign role:', err.message));
+      await laneRequest('bulk', () => member.roles.add(welcomeRole), restBucket(member.guild.id, '/guilds/:id/members/:id/roles/:id'))
+        .catch(err => console.log('Cannot assign role:', err.message));
     }
 
     // 3. Send welcome message
@@ -178,7 +1014,7 @@ client.on('guildMemberAdd', async member => {
         .setThumbnail(member.user.displayAvatarURL({ dynamic: true }))
         .setTimestamp();
 
-      await welcomeChannel.send({ embeds: [welcomeEmbed] });
+      await laneRequest('replies', () => welcomeChannel.send({ embeds: [welcomeEmbed] }), restBucket(welcomeChannel.id, '/channels/:id/messages'));
     }
 
     // 4. Log the join
@@ -195,7 +1031,7 @@ client.on('guildMemberAdd', async member => {
         .setThumbnail(member.user.displayAvatarURL({ dynamic: true }))
         .setTimestamp();
 
-      await logChannel.send({ embeds: [joinEmbed] });
+      await laneRequest('logs', () => logChannel.send({ embeds: [joinEmbed] }), restBucket(logChannel.id, '/channels/:id/messages'));
     }
   } catch (error) {
     console.error('Error in guildMemberAdd event:', error);
@@ -216,10 +1052,34 @@ client.on('guildMemberRemove', async member => {
       .setThumbnail(member.user.displayAvatarURL({ dynamic: true }))
       .setTimestamp();
 
-    await logChannel.send({ embeds: [leaveEmbed] });
+    await laneRequest('logs', () => logChannel.send({ embeds: [leaveEmbed] }), restBucket(logChannel.id, '/channels/:id/messages'));
   }
 });
 
+// ============ EVENT: REST RATE LIMIT ============
+client.rest.on('rateLimited', info => {
+  rateLimitResets.set(restBucket(info.majorParameter, info.route), Date.now() + info.timeToReset);
+});
+
+// ============ EVENT: GATEWAY CAPTURE ============
+// Records decoded gateway payloads so !gateway bench can replay them
+const gatewayCapture = { stream: null, count: 0, file: path.join(CONFIG.DATA_DIR, 'gateway-capture.jsonl') };
+
+if (CONFIG.GATEWAY_CAPTURE) {
+  client.on('raw', packet => {
+    if (gatewayCapture.count >= CONFIG.GATEWAY_CAPTURE_LIMIT) return;
+    if (!gatewayCapture.stream) {
+      gatewayCapture.stream = fs.createWriteStream(gatewayCapture.file);
+    }
+    gatewayCapture.stream.write(`${JSON.stringify(packet)}\n`);
+    gatewayCapture.count++;
+    if (gatewayCapture.count === CONFIG.GATEWAY_CAPTURE_LIMIT) {
+      gatewayCapture.stream.end();
+      console.log(`📡 Captured ${gatewayCapture.count} gateway payloads to ${gatewayCapture.file}`);
+    }
+  });
+}
+
 // ============ VPS HOSTING COMMAND ============
 client.on('messageCreate', message => {
   if (isCommand(message, 'vps')) {
@@ -318,8 +1178,9 @@ client.on('messageCreate', message => {
       .addFields(
         { name: '💼 Hosting Commands', value: '`!vps` - VPS hosting plans\n`!gameserver` - Game server plans\n`!dcbot` - Discord bot hosting\n`!web` - Web hosting plans', inline: false },
         { name: '🎫 Support', value: '`!ticket [reason]` - Create a support ticket', inline: false },
-        { name: '🛡️ Moderation (Admin Only)', value: '`!warn @user [reason]` - Warn a user\n`!kick @user [reason]` - Kick a user\n`!ban @user [reason]` - Ban a user\n`!timeout @user [minutes] [reason]` - Timeout a user\n`!warnings @user` - Check user warnings\n`!clearwarnings @user` - Clear warnings\n`!nicknameall` - Set TC| for all members\n`!nicknameall force` - Force TC| for everyone', inline: false },
-        { name: '⚙️ Utility', value: '`!serverinfo` - Server information\n`!userinfo [@user]` - User information\n`!ping` - Check bot latency', inline: false }
+        { name: '🛡️ Moderation (Admin Only)', value: '`!warn @user [reason]` - Warn a user\n`!kick @user [reason]` - Kick a user\n`!ban @user [reason]` - Ban a user\n`!tempban @user <duration> [reason]` - Ban a user for a while (e.g. 12h, 7d)\n`!timeout @user [minutes] [reason]` - Timeout a user\n`!warnings @user` - Check user warnings\n`!clearwarnings @user` - Clear warnings\n`!purge <count> [@user|bots|contains:text]` - Bulk delete messages\n`!nicknameall` - Set TC| for all members\n`!nicknameall force` - Force TC| for everyone\n`!roleall <role>` - Give a role to everyone\n`!roleall remove <role>` - Remove a role from everyone\n`!job status|pause|resume|cancel` - Manage the running bulk job', inline: false },
+        { name: '⚙️ Utility', value: '`!serverinfo` - Server information\n`!userinfo [@user]` - User information\n`!ping` - Check bot latency', inline: false },
+        { name: '🩺 Diagnostics (Admin Only)', value: '`!profile cpu <seconds>` - Record a CPU profile\n`!profile heap` - Take a heap snapshot\n`!gateway` - Gateway transport mode\n`!gateway bench` - Compare transports on captured payloads\n`!lanes` - REST queue wait times per priority lane', inline: false }
       )
       .setFooter({ text: 'Trapo Cloud™ - Premium Hosting Services' })
       .setTimestamp();
@@ -363,11 +1224,13 @@ client.on('messageCreate', async message => {
     if (!warnings.has(user.id)) {
       warnings.set(user.id, []);
     }
+    const warnedAt = Date.now();
     warnings.get(user.id).push({
       moderator: message.author.tag,
       reason,
-      timestamp: Date.now()
+      timestamp: warnedAt
     });
+    scheduleTask('expireWarning', CONFIG.WARNING_EXPIRY_DAYS * 24 * 60 * 60 * 1000, { userId: user.id, timestamp: warnedAt });
 
     const warnCount = warnings.get(user.id).length;
 
@@ -383,7 +1246,7 @@ client.on('messageCreate', async message => {
       )
       .setTimestamp();
 
-    message.channel.send({ embeds: [warnEmbed] });
+    laneRequest('replies', () => message.channel.send({ embeds: [warnEmbed] }), restBucket(message.channel.id, '/channels/:id/messages'));
 
     // Log moderation
     await logModeration(message.guild, 'WARN', user, message.author, reason, [
@@ -433,7 +1296,7 @@ client.on('messageCreate', async message => {
     }
 
     // Kick the member
-    await member.kick(reason);
+    await laneRequest('moderation', () => member.kick(reason));
 
     // Send confirmation
     const kickEmbed = new EmbedBuilder()
@@ -446,7 +1309,7 @@ client.on('messageCreate', async message => {
       )
       .setTimestamp();
 
-    message.channel.send({ embeds: [kickEmbed] });
+    laneRequest('replies', () => message.channel.send({ embeds: [kickEmbed] }), restBucket(message.channel.id, '/channels/:id/messages'));
 
     // Log moderation
     await logModeration(message.guild, 'KICK', member.user, message.author, reason);
@@ -484,7 +1347,7 @@ client.on('messageCreate', async message => {
     }
 
     // Ban the member
-    await member.ban({ reason });
+    await laneRequest('moderation', () => member.ban({ reason }));
 
     // Send confirmation
     const banEmbed = new EmbedBuilder()
@@ -497,13 +1360,75 @@ client.on('messageCreate', async message => {
       )
       .setTimestamp();
 
-    message.channel.send({ embeds: [banEmbed] });
+    laneRequest('replies', () => message.channel.send({ embeds: [banEmbed] }), restBucket(message.channel.id, '/channels/:id/messages'));
 
     // Log moderation
     await logModeration(message.guild, 'BAN', member.user, message.author, reason);
   }
 });
 
+// ============ TEMPBAN COMMAND ============
+client.on('messageCreate', async message => {
+  if (isCommand(message, 'tempban')) {
+    if (message.author.bot) return;
+    if (!message.member.permissions.has(PermissionFlagsBits.BanMembers)) {
+      return message.reply('❌ You do not have permission to use this command.');
+    }
+
+    const args = message.content.slice(9).trim().split(/ +/);
+    const member = message.mentions.members.first();
+    const duration = parseDuration(args[1]);
+    const reason = args.slice(2).join(' ') || 'No reason provided';
+
+    if (!member) {
+      return message.reply('❌ Please mention a user to ban.');
+    }
+
+    if (!duration) {
+      return message.reply('❌ Please provide a duration like `30m`, `12h` or `7d`.');
+    }
+
+    if (!member.bannable) {
+      return message.reply('❌ I cannot ban this user.');
+    }
+
+    const unbanAt = Math.floor((Date.now() + duration) / 1000);
+
+    // Create ticket before banning
+    await createSupportTicket(message.guild, member.id, `User was temporarily banned until <t:${unbanAt}:F>: ${reason}`, message.author.id);
+
+    // DM user before banning
+    try {
+      await member.send(`🔨 You have been temporarily banned from **${message.guild.name}**\n**Reason:** ${reason}\n**Expires:** <t:${unbanAt}:F>\n\nA support ticket has been created for appeals.`);
+    } catch (error) {
+      console.log('Cannot DM user:', error.message);
+    }
+
+    // Ban the member and schedule the unban
+    await laneRequest('moderation', () => member.ban({ reason }));
+    scheduleTask('unban', duration, { guildId: message.guild.id, userId: member.id, reason: `Temporary ban from ${message.author.tag} expired` });
+
+    // Send confirmation
+    const banEmbed = new EmbedBuilder()
+      .setTitle('🔨 User Temporarily Banned')
+      .setColor(0xe74c3c)
+      .addFields(
+        { name: '👤 User', value: `${member.user.tag}`, inline: true },
+        { name: '👮 Moderator', value: `${message.author.tag}`, inline: true },
+        { name: '⏰ Expires', value: `<t:${unbanAt}:R>`, inline: true },
+        { name: '📝 Reason', value: reason, inline: false }
+      )
+      .setTimestamp();
+
+    laneRequest('replies', () => message.channel.send({ embeds: [banEmbed] }), restBucket(message.channel.id, '/channels/:id/messages'));
+
+    // Log moderation
+    await logModeration(message.guild, 'TEMPBAN', member.user, message.author, reason, [
+      { name: '⏰ Expires', value: `<t:${unbanAt}:F>`, inline: true }
+    ]);
+  }
+});
+
 // ============ TIMEOUT COMMAND ============
 client.on('messageCreate', async message => {
   if (isCommand(message, 'timeout')) {
@@ -526,7 +1451,7 @@ client.on('messageCreate', async message => {
     }
 
     // Timeout the member
-    await member.timeout(duration * 60 * 1000, reason);
+    await laneRequest('moderation', () => member.timeout(duration * 60 * 1000, reason));
 
     // Create ticket
     await createSupportTicket(message.guild, member.id, `User was timed out for ${duration} minutes: ${reason}`, message.author.id);
@@ -543,7 +1468,7 @@ client.on('messageCreate', async message => {
       )
       .setTimestamp();
 
-    message.channel.send({ embeds: [timeoutEmbed] });
+    laneRequest('replies', () => message.channel.send({ embeds: [timeoutEmbed] }), restBucket(message.channel.id, '/channels/:id/messages'));
 
     // Log moderation
     await logModeration(message.guild, 'TIMEOUT', member.user, message.author, reason, [
@@ -606,46 +1531,341 @@ client.on('messageCreate', async message => {
   }
 });
 
-// ============ SERVER INFO COMMAND ============
-client.on('messageCreate', message => {
-  if (isCommand(message, 'serverinfo')) {
-    const embed = new EmbedBuilder()
-      .setTitle(`📊 ${message.guild.name} Server Info`)
-      .setColor(0x3498db)
-      .setThumbnail(message.guild.iconURL({ dynamic: true }))
-      .addFields(
-        { name: '👑 Owner', value: `<@${message.guild.ownerId}>`, inline: true },
-        { name: '📅 Created', value: `<t:${Math.floor(message.guild.createdTimestamp / 1000)}:R>`, inline: true },
-        { name: '👥 Members', value: `${message.guild.memberCount}`, inline: true },
-        { name: '📝 Channels', value: `${message.guild.channels.cache.size}`, inline: true },
-        { name: '🎭 Roles', value: `${message.guild.roles.cache.size}`, inline: true },
-        { name: '😀 Emojis', value: `${message.guild.emojis.cache.size}`, inline: true }
-      )
-      .setTimestamp();
+// ============ PURGE COMMAND ============
+const BULK_DELETE_MAX_AGE = 14 * 24 * 60 * 60 * 1000 - 60 * 1000; // Discord's 14 day limit, with a minute of slack
+const OLD_MESSAGE_DELETE_ROUTE = '/channels/:id/messages/:id/Delete Old Message'; // Bucket @discordjs/rest uses for deleting messages past 14 days
 
-    message.channel.send({ embeds: [embed] });
+client.on('messageCreate', async message => {
+  if (isCommand(message, 'purge')) {
+    if (message.author.bot) return;
+    if (!message.member.permissions.has(PermissionFlagsBits.ManageMessages)) {
+      return message.reply('❌ You do not have permission to use this command.');
+    }
+
+    const args = message.content.split(/ +/).slice(1);
+    const count = parseInt(args[0]);
+    if (!count || count < 1 || count > CONFIG.PURGE_MAX_COUNT) {
+      return message.reply(`❌ Please provide a number of messages between 1 and ${CONFIG.PURGE_MAX_COUNT}.`);
+    }
+
+    // Optional filter: @user, bots or contains:text
+    const targetUser = message.mentions.users.first();
+    const containsIndex = message.content.indexOf('contains:');
+    const containsText = containsIndex === -1 ? null : message.content.slice(containsIndex + 9).trim().toLowerCase();
+    const botsOnly = args[1] === 'bots';
+    let filterLabel = 'All messages';
+    if (targetUser) filterLabel = `From ${targetUser.tag}`;
+    else if (botsOnly) filterLabel = 'From bots';
+    else if (containsText) filterLabel = `Containing "${containsText}"`;
+
+    const matches = (msg) => {
+      if (msg.pinned) return false;
+      if (targetUser) return msg.author.id === targetUser.id;
+      if (botsOnly) return msg.author.bot;
+      if (containsText) return msg.content.toLowerCase().includes(containsText);
+      return true;
+    };
+
+    const channel = message.channel;
+    await message.delete().catch(() => {});
+
+    const statusMessage = await channel.send({ embeds: [new EmbedBuilder()
+      .setTitle('🧹 Purge Started')
+      .setColor(0xf39c12)
+      .setDescription(`**Filter:** ${filterLabel}\n**Status:** Scanning messages...`)
+      .setTimestamp()] });
+
+    let scanned = 0;
+    let matched = 0;
+    let bulkDeleted = 0;
+    let singleDeleted = 0;
+    let failed = 0;
+    let lastUpdate = Date.now();
+    const started = Date.now();
+    const oldMessages = [];
+
+    const sendProgress = async () => {
+      if (Date.now() - lastUpdate < 5000) return;
+      lastUpdate = Date.now();
+      await laneRequest('replies', () => statusMessage.edit({ embeds: [new EmbedBuilder()
+        .setTitle('🧹 Purge In Progress')
+        .setColor(0xf39c12)
+        .setDescription(`**Filter:** ${filterLabel}`)
+        .addFields(
+          { name: '🔍 Scanned', value: `${scanned}`, inline: true },
+          { name: '🗑️ Deleted', value: `${bulkDeleted + singleDeleted}/${matched}`, inline: true },
+          { name: '❌ Failed', value: `${failed}`, inline: true }
+        )
+        .setTimestamp()] }), restBucket(channel.id, '/channels/:id/messages/:id')).catch(() => {});
+    };
+
+    try {
+      let before = statusMessage.id;
+      let batch = [];
+
+      const flushBatch = async () => {
+        if (batch.length === 0) return;
+        if (batch.length === 1) {
+          // bulkDelete needs at least two messages
+          await batch[0].delete().then(() => singleDeleted++).catch(() => failed++);
+        } else {
+          const deleted = await laneRequest('moderation', () => channel.bulkDelete(batch, true));
+          bulkDeleted += deleted.size;
+          failed += batch.length - deleted.size;
+        }
+        batch = [];
+        await sendProgress();
+      };
+
+      // Page through history newest to oldest, filtering in memory
+      while (matched < count && scanned < CONFIG.PURGE_SCAN_LIMIT) {
+        const page = await channel.messages.fetch({ limit: 100, before });
+        if (page.size === 0) break;
+        before = page.last().id;
+        scanned += page.size;
+
+        for (const msg of page.values()) {
+          if (matched >= count) break;
+          if (!matches(msg)) continue;
+          matched++;
+
+          if (Date.now() - msg.createdTimestamp < BULK_DELETE_MAX_AGE) {
+            batch.push(msg);
+            if (batch.length === 100) await flushBatch();
+          } else {
+            oldMessages.push(msg);
+          }
+        }
+      }
+      await flushBatch();
+
+      // Messages past the bulk delete window have to go one at a time
+      for (const msg of oldMessages) {
+        try {
+          await laneRequest('bulk', () => msg.delete(), restBucket(channel.id, OLD_MESSAGE_DELETE_ROUTE));
+          singleDeleted++;
+        } catch (error) {
+          failed++;
+        }
+        await sendProgress();
+      }
+
+      const deletedTotal = bulkDeleted + singleDeleted;
+      const summaryEmbed = new EmbedBuilder()
+        .setTitle('✅ Purge Complete!')
+        .setColor(0x2ecc71)
+        .setDescription(`**Filter:** ${filterLabel}`)
+        .addFields(
+          { name: '🔍 Scanned', value: `${scanned}`, inline: true },
+          { name: '🗑️ Deleted', value: `${deletedTotal}`, inline: true },
+          { name: '❌ Failed', value: `${failed}`, inline: true },
+          { name: '⚡ Bulk / Single', value: `${bulkDeleted} / ${singleDeleted}`, inline: true },
+          { name: '⏱️ Time Taken', value: `${((Date.now() - started) / 1000).toFixed(1)}s`, inline: true }
+        )
+        .setFooter({ text: `Requested by ${message.author.tag}` })
+        .setTimestamp();
+
+      await statusMessage.edit({ embeds: [summaryEmbed] });
+
+      await logModeration(message.guild, 'PURGE', message.author, message.author,
+        `Deleted ${deletedTotal} messages in #${channel.name} (${filterLabel})`, [
+          { name: '📝 Channel', value: `${channel}`, inline: true },
+          { name: '🗑️ Deleted', value: `${deletedTotal}`, inline: true },
+          { name: '❌ Failed', value: `${failed}`, inline: true }
+        ]);
+
+    } catch (error) {
+      console.error('Error in purge:', error);
+
+      const errorEmbed = new EmbedBuilder()
+        .setTitle('❌ Purge Failed')
+        .setColor(0xe74c3c)
+        .setDescription(`An error occurred: ${error.message}\n**Deleted before failure:** ${bulkDeleted + singleDeleted}`)
+        .setTimestamp();
+
+      await statusMessage.edit({ embeds: [errorEmbed] }).catch(() => {});
+    }
+  }
+});
+
+// ============ INFO CACHE ============
+// Counters and member summaries kept up to date from gateway events, plus
+// short-lived rendered embeds for !serverinfo and !userinfo
+const guildStats = new Map(); // guildId -> { channels (threads excluded), roles, emojis }
+const memberSummaries = new Map(); // guildId -> Map(userId -> { joinedTimestamp, roles } | null)
+const renderedInfo = new Map(); // 'serverinfo:guildId' / 'userinfo:guildId:userId' -> { payload, expiresAt }
+const memberFetches = new Map(); // `${guildId}:${userId}` -> in-flight summary promise
+
+function getGuildStats(guild) {
+  let stats = guildStats.get(guild.id);
+  if (!stats) {
+    stats = {
+      // Threads are left out: their cache fills and empties with archive/list syncs
+      channels: guild.channels.cache.filter(channel => !channel.isThread()).size,
+      roles: guild.roles.cache.size,
+      emojis: guild.emojis.cache.size,
+    };
+    guildStats.set(guild.id, stats);
+  }
+  return stats;
+}
+
+function adjustGuildStat(guild, key, delta) {
+  if (!guild) return;
+  const stats = guildStats.get(guild.id);
+  if (stats) stats[key] += delta;
+  renderedInfo.delete(`serverinfo:${guild.id}`);
+}
+
+function summarizeMember(member) {
+  return {
+    joinedTimestamp: member.joinedTimestamp,
+    roles: member.roles.cache.map(r => r.name).slice(0, 5).join(', '),
+  };
+}
+
+// Only refreshes members someone has already looked up, so memory stays bounded
+function refreshMemberSummary(guildId, userId, summary) {
+  const summaries = memberSummaries.get(guildId);
+  if (summaries?.has(userId)) summaries.set(userId, summary);
+  renderedInfo.delete(`userinfo:${guildId}:${userId}`);
+}
+
+function forgetGuildMembers(guildId) {
+  memberSummaries.delete(guildId);
+  for (const key of renderedInfo.keys()) {
+    if (key.startsWith(`userinfo:${guildId}:`)) renderedInfo.delete(key);
+  }
+}
+
+async function getMemberSummary(guild, userId) {
+  const summaries = memberSummaries.get(guild.id);
+  if (summaries?.has(userId)) return summaries.get(userId);
+
+  // Single flight: concurrent lookups for the same member share one fetch
+  const key = `${guild.id}:${userId}`;
+  if (!memberFetches.has(key)) {
+    const cached = guild.members.cache.get(userId);
+    const lookup = (cached ? Promise.resolve(cached) : guild.members.fetch(userId))
+      .catch(error => {
+        // Only "not a member" is a real answer; other failures are retried on the next lookup
+        if (error.code === RESTJSONErrorCodes.UnknownMember) return null;
+        throw error;
+      })
+      .then(member => {
+        const summary = member ? summarizeMember(member) : null;
+        if (!memberSummaries.has(guild.id)) memberSummaries.set(guild.id, new Map());
+        memberSummaries.get(guild.id).set(userId, summary);
+        return summary;
+      })
+      .finally(() => memberFetches.delete(key));
+    memberFetches.set(key, lookup);
+  }
+  return memberFetches.get(key);
+}
+
+async function getRenderedInfo(key, render) {
+  const cached = renderedInfo.get(key);
+  if (cached && cached.expiresAt > Date.now()) return cached.payload;
+
+  const payload = await render();
+  renderedInfo.delete(key);
+  renderedInfo.set(key, { payload, expiresAt: Date.now() + CONFIG.INFO_CACHE_TTL });
+  if (renderedInfo.size > CONFIG.INFO_CACHE_MAX_ENTRIES) {
+    renderedInfo.delete(renderedInfo.keys().next().value);
+  }
+  return payload;
+}
+
+client.on('channelCreate', channel => adjustGuildStat(channel.guild, 'channels', 1));
+client.on('channelDelete', channel => adjustGuildStat(channel.guild, 'channels', -1));
+client.on('emojiCreate', emoji => adjustGuildStat(emoji.guild, 'emojis', 1));
+client.on('emojiDelete', emoji => adjustGuildStat(emoji.guild, 'emojis', -1));
+client.on('roleCreate', role => adjustGuildStat(role.guild, 'roles', 1));
+client.on('roleDelete', role => {
+  adjustGuildStat(role.guild, 'roles', -1);
+  forgetGuildMembers(role.guild.id);
+});
+client.on('roleUpdate', (oldRole, newRole) => {
+  if (oldRole.name !== newRole.name || oldRole.position !== newRole.position) forgetGuildMembers(newRole.guild.id);
+});
+client.on('guildUpdate', (oldGuild, newGuild) => renderedInfo.delete(`serverinfo:${newGuild.id}`));
+client.on('guildDelete', guild => {
+  guildStats.delete(guild.id);
+  renderedInfo.delete(`serverinfo:${guild.id}`);
+  forgetGuildMembers(guild.id);
+});
+client.on('guildMemberAdd', member => {
+  renderedInfo.delete(`serverinfo:${member.guild.id}`);
+  refreshMemberSummary(member.guild.id, member.id, summarizeMember(member));
+});
+client.on('guildMemberRemove', member => {
+  renderedInfo.delete(`serverinfo:${member.guild.id}`);
+  refreshMemberSummary(member.guild.id, member.id, null);
+});
+client.on('guildMemberUpdate', (oldMember, newMember) => {
+  refreshMemberSummary(newMember.guild.id, newMember.id, summarizeMember(newMember));
+});
+client.on('userUpdate', (oldUser, newUser) => {
+  for (const key of renderedInfo.keys()) {
+    if (key.startsWith('userinfo:') && key.endsWith(`:${newUser.id}`)) renderedInfo.delete(key);
+  }
+});
+
+// ============ SERVER INFO COMMAND ============
+client.on('messageCreate', async message => {
+  if (isCommand(message, 'serverinfo')) {
+    const guild = message.guild;
+    const payload = await getRenderedInfo(`serverinfo:${guild.id}`, () => {
+      const stats = getGuildStats(guild);
+      return new EmbedBuilder()
+        .setTitle(`📊 ${guild.name} Server Info`)
+        .setColor(0x3498db)
+        .setThumbnail(guild.iconURL({ dynamic: true }))
+        .addFields(
+          { name: '👑 Owner', value: `<@${guild.ownerId}>`, inline: true },
+          { name: '📅 Created', value: `<t:${Math.floor(guild.createdTimestamp / 1000)}:R>`, inline: true },
+          { name: '👥 Members', value: `${guild.memberCount}`, inline: true },
+          { name: '📝 Channels', value: `${stats.channels}`, inline: true },
+          { name: '🎭 Roles', value: `${stats.roles}`, inline: true },
+          { name: '😀 Emojis', value: `${stats.emojis}`, inline: true }
+        )
+        .setTimestamp()
+        .toJSON();
+    });
+
+    message.channel.send({ embeds: [payload] });
   }
 });
 
 // ============ USER INFO COMMAND ============
-client.on('messageCreate', message => {
+client.on('messageCreate', async message => {
   if (isCommand(message, 'userinfo')) {
     const user = message.mentions.users.first() || message.author;
-    const member = message.guild.members.cache.get(user.id);
+    let member;
+    try {
+      member = await getMemberSummary(message.guild, user.id);
+    } catch (error) {
+      console.log('Cannot fetch member:', error.message);
+      return message.reply('❌ Could not load member info right now. Please try again.');
+    }
 
-    const embed = new EmbedBuilder()
-      .setTitle(`👤 User Info: ${user.tag}`)
-      .setColor(0x9b59b6)
-      .setThumbnail(user.displayAvatarURL({ dynamic: true }))
-      .addFields(
-        { name: '🆔 ID', value: user.id, inline: true },
-        { name: '📅 Account Created', value: `<t:${Math.floor(user.createdTimestamp / 1000)}:R>`, inline: true },
-        { name: '📥 Joined Server', value: member ? `<t:${Math.floor(member.joinedTimestamp / 1000)}:R>` : 'N/A', inline: true },
-        { name: '🎭 Roles', value: member ? member.roles.cache.map(r => r.name).slice(0, 5).join(', ') : 'N/A', inline: false }
-      )
-      .setTimestamp();
+    const payload = await getRenderedInfo(`userinfo:${message.guild.id}:${user.id}`, () => {
+      return new EmbedBuilder()
+        .setTitle(`👤 User Info: ${user.tag}`)
+        .setColor(0x9b59b6)
+        .setThumbnail(user.displayAvatarURL({ dynamic: true }))
+        .addFields(
+          { name: '🆔 ID', value: user.id, inline: true },
+          { name: '📅 Account Created', value: `<t:${Math.floor(user.createdTimestamp / 1000)}:R>`, inline: true },
+          { name: '📥 Joined Server', value: member ? `<t:${Math.floor(member.joinedTimestamp / 1000)}:R>` : 'N/A', inline: true },
+          { name: '🎭 Roles', value: member ? member.roles : 'N/A', inline: false }
+        )
+        .setTimestamp()
+        .toJSON();
+    });
 
-    message.channel.send({ embeds: [embed] });
+    message.channel.send({ embeds: [payload] });
   }
 });
 
@@ -654,13 +1874,16 @@ client.on('messageCreate', message => {
   if (isCommand(message, 'ping')) {
     const latency = Date.now() - message.createdTimestamp;
     const apiLatency = Math.round(client.ws.ping);
+    const loopLag = (eventLoopDelay.percentile(99) / 1e6).toFixed(1);
+    eventLoopDelay.reset();
 
     const embed = new EmbedBuilder()
       .setTitle('🏓 Pong!')
       .setColor(0x2ecc71)
       .addFields(
         { name: '⏱️ Latency', value: `${latency}ms`, inline: true },
-        { name: '📡 API Latency', value: `${apiLatency}ms`, inline: true }
+        { name: '📡 API Latency', value: `${apiLatency}ms`, inline: true },
+        { name: '🌀 Event Loop Lag', value: `p99 ${loopLag}ms`, inline: true }
       )
       .setTimestamp();
 
@@ -668,144 +1891,610 @@ client.on('messageCreate', message => {
   }
 });
 
-// ============ BULK NICKNAME COMMAND ============
+// ============ PROFILE COMMAND ============
+let activeProfile = null; // Only one capture at a time
+
+function inspectorPost(session, method, params = {}) {
+  return new Promise((resolve, reject) => {
+    session.post(method, params, (error, result) => error ? reject(error) : resolve(result));
+  });
+}
+
+async function captureCpuProfile(seconds) {
+  const session = new inspector.Session();
+  session.connect();
+  try {
+    await inspectorPost(session, 'Profiler.enable');
+    await inspectorPost(session, 'Profiler.start');
+    await new Promise(resolve => setTimeout(resolve, seconds * 1000));
+    const { profile } = await inspectorPost(session, 'Profiler.stop');
+
+    const file = path.join(CONFIG.PROFILE_DIR, `cpu-${Date.now()}.cpuprofile`);
+    await fs.promises.writeFile(file, JSON.stringify(profile));
+    const { functions, overheadMs } = await runTask('summarizeCpuProfile', { profile, limit: 10 });
+    return { file, top: functions, overheadMs };
+  } finally {
+    session.disconnect();
+  }
+}
+
+async function captureHeapSnapshot() {
+  const file = path.join(CONFIG.PROFILE_DIR, `heap-${Date.now()}.heapsnapshot`);
+  const fd = fs.openSync(file, 'w');
+  const session = new inspector.Session();
+  try {
+    session.connect();
+    // Chunks arrive synchronously inside takeHeapSnapshot, so write each one
+    // to disk right away; a write stream would buffer the whole snapshot
+    session.on('HeapProfiler.addHeapSnapshotChunk', ({ params }) => fs.writeSync(fd, params.chunk));
+    await inspectorPost(session, 'HeapProfiler.takeHeapSnapshot', { reportProgress: false });
+  } finally {
+    session.disconnect();
+    fs.closeSync(fd);
+  }
+  const top = await runTask('summarizeHeapSnapshot', { file, limit: 10 });
+  return { file, top };
+}
+
 client.on('messageCreate', async message => {
-  if (isCommand(message, 'nicknameall')) {
+  if (isCommand(message, 'profile')) {
     if (message.author.bot) return;
-    
-    // Check for Administrator permission
     if (!message.member.permissions.has(PermissionFlagsBits.Administrator)) {
       return message.reply('❌ You need Administrator permission to use this command.');
     }
 
-    const args = message.content.split(' ');
-    const forceMode = args.includes('force');
+    const args = message.content.split(/ +/).slice(1);
+    const mode = args[0];
+    if (mode !== 'cpu' && mode !== 'heap') {
+      return message.reply(`❌ Usage: \`${CONFIG.COMMAND_PREFIX}profile cpu <seconds>\` or \`${CONFIG.COMMAND_PREFIX}profile heap\``);
+    }
+    if (activeProfile) {
+      return message.reply(`❌ A ${activeProfile} profile is already running.`);
+    }
 
-    // Send initial message
-    const initialEmbed = new EmbedBuilder()
-      .setTitle('🔄 Bulk Nickname Update Started')
-      .setColor(0xf39c12)
-      .setDescription(forceMode 
-        ? '**Mode:** Force (overwrites all nicknames)\n**Status:** Fetching members...'
-        : '**Mode:** Normal (only users without nicknames)\n**Status:** Fetching members...')
-      .setTimestamp();
+    const seconds = Math.min(Math.max(parseInt(args[1]) || 10, 1), CONFIG.PROFILE_MAX_SECONDS);
+    activeProfile = mode;
+
+    try {
+      await fs.promises.mkdir(CONFIG.PROFILE_DIR, { recursive: true });
+      await message.reply(mode === 'cpu'
+        ? `🩺 Recording CPU profile for ${seconds} seconds...`
+        : '🩺 Taking heap snapshot...');
+
+      const started = Date.now();
+      const { file, top, overheadMs } = mode === 'cpu' ? await captureCpuProfile(seconds) : await captureHeapSnapshot();
+      const lines = mode === 'cpu'
+        ? top.map((entry, index) => `${index + 1}. \`${entry.name}\` - ${entry.ms.toFixed(1)}ms`)
+        : top.map((entry, index) => `${index + 1}. \`${entry.name}\` - ${(entry.bytes / 1024 / 1024).toFixed(2)}MB (${entry.count})`);
+
+      const embed = new EmbedBuilder()
+        .setTitle(mode === 'cpu' ? '🩺 CPU Profile Captured' : '🩺 Heap Snapshot Captured')
+        .setColor(0x3498db)
+        .setDescription((mode === 'cpu' ? '**Top functions by self time:**\n' : '**Top constructors by shallow size:**\n') +
+          (lines.join('\n') || 'No samples recorded').slice(0, 3900))
+        .addFields(
+          { name: '📁 File', value: `\`${path.basename(file)}\``, inline: true },
+          { name: '⏱️ Took', value: `${((Date.now() - started) / 1000).toFixed(1)}s`, inline: true }
+        )
+        .setTimestamp();
+      if (overheadMs) {
+        embed.addFields({
+          name: '💤 Idle / Program / GC',
+          value: `${overheadMs.idle.toFixed(0)}ms / ${overheadMs.program.toFixed(0)}ms / ${overheadMs.gc.toFixed(0)}ms`,
+          inline: true
+        });
+      }
+
+      await message.channel.send({ embeds: [embed] });
+    } catch (error) {
+      console.error('Error while profiling:', error);
+      message.reply(`❌ Profiling failed: ${error.message}`);
+    } finally {
+      activeProfile = null;
+    }
+  }
+});
+
+// ============ GATEWAY COMMAND ============
+client.on('messageCreate', async message => {
+  if (isCommand(message, 'gateway')) {
+    if (message.author.bot) return;
+    if (!message.member.permissions.has(PermissionFlagsBits.Administrator)) {
+      return message.reply('❌ You need Administrator permission to use this command.');
+    }
+
+    const args = message.content.split(/ +/).slice(1);
+
+    if (args[0] !== 'bench') {
+      const transport = describeGatewayTransport();
+      const embed = new EmbedBuilder()
+        .setTitle('📡 Gateway Transport')
+        .setColor(0x3498db)
+        .addFields(
+          { name: '🗜️ Compression', value: transport.compression, inline: true },
+          { name: '🔤 Encoding', value: transport.encoding, inline: true },
+          { name: '📼 Capture', value: CONFIG.GATEWAY_CAPTURE ? `${gatewayCapture.count}/${CONFIG.GATEWAY_CAPTURE_LIMIT} payloads` : 'Off (set GATEWAY_CAPTURE=true)', inline: true }
+        )
+        .setTimestamp();
+      if (gatewayTransport.notes.length) {
+        embed.setDescription(`⚠️ ${gatewayTransport.notes.join('\n⚠️ ')}`);
+      }
+      return message.channel.send({ embeds: [embed] });
+    }
 
-    const statusMessage = await message.channel.send({ embeds: [initialEmbed] });
+    if (!fs.existsSync(gatewayCapture.file)) {
+      return message.reply('❌ No captured payloads yet. Start the bot with `GATEWAY_CAPTURE=true` first.');
+    }
 
     try {
-      // Fetch all members
-      await message.guild.members.fetch();
-      const members = message.guild.members.cache;
-      
-      let processed = 0;
-      let updated = 0;
-      let skipped = 0;
-      let failed = 0;
-      const total = members.size;
+      const bench = await runTask('benchGatewayPayloads', { file: gatewayCapture.file });
+      const embed = new EmbedBuilder()
+        .setTitle('📡 Gateway Transport Benchmark')
+        .setColor(0x2ecc71)
+        .setDescription(`Replayed **${bench.payloads}** captured payloads`)
+        .addFields(bench.results.map(result => ({
+          name: result.mode,
+          value: `📦 ${(result.bytes / 1024).toFixed(1)} KB\n⏱️ ${result.decodeMs.toFixed(1)}ms decode`,
+          inline: true
+        })))
+        .setTimestamp();
+      message.channel.send({ embeds: [embed] });
+    } catch (error) {
+      console.error('Error in gateway benchmark:', error);
+      message.reply(`❌ Benchmark failed: ${error.message}`);
+    }
+  }
+});
 
-      // Update progress every 50 members
-      let lastUpdate = Date.now();
+// ============ LANES COMMAND ============
+client.on('messageCreate', message => {
+  if (isCommand(message, 'lanes')) {
+    if (message.author.bot) return;
+    if (!message.member.permissions.has(PermissionFlagsBits.Administrator)) {
+      return message.reply('❌ You need Administrator permission to use this command.');
+    }
 
-      for (const [memberId, member] of members) {
-        processed++;
+    const embed = new EmbedBuilder()
+      .setTitle('🚦 REST Priority Lanes')
+      .setColor(0x3498db)
+      .setDescription(`**In flight:** ${restScheduler.inFlight} (${CONFIG.REST_BUCKET_CONCURRENCY} per bucket, moderation uncapped)\n**Keep-alive pool:** ${restAgent ? 'On' : 'Default (undici not found)'}`)
+      .addFields(getLaneStats().map(lane => ({
+        name: `${lane.name} (weight ${REST_LANES[lane.name].weight})`,
+        value: `📥 ${lane.queued} queued, ${lane.inFlight} in flight\n✅ ${lane.completed} done\n⏱️ wait p50 ${lane.p50}ms / p95 ${lane.p95}ms / max ${lane.max}ms`,
+        inline: true
+      })))
+      .setTimestamp();
 
-        // Skip bots
-        if (member.user.bot) {
-          skipped++;
-          continue;
-        }
+    message.channel.send({ embeds: [embed] });
+  }
+});
 
-        // Skip server owner (can't change their nickname)
-        if (member.id === message.guild.ownerId) {
+// ============ BULK JOB ENGINE ============
+// One bulk member job per guild. The member list and a cursor are saved to
+// disk while the job runs, so a restart picks up where it stopped.
+const BULK_JOB_DIR = path.join(CONFIG.DATA_DIR, 'jobs');
+const bulkJobs = new Map(); // guildId -> { type, guildId, channelId, statusMessageId, requestedBy, options, memberIds, cursor, counts, state, startedAt }
+const runningBulkJobs = new Set(); // guildIds with an active runner loop
+
+const BULK_JOB_TYPES = {
+  nickname: {
+    title: 'Bulk Nickname Update',
+    logAction: 'BULK NICKNAME UPDATE',
+    describe: (job) => job.options.forceMode
+      ? '**Mode:** Force (overwrites all nicknames)'
+      : '**Mode:** Normal (only users without nicknames)',
+    async plan(guild, options) {
+      const memberIds = [];
+      let skipped = 0;
+      for (const member of guild.members.cache.values()) {
+        // Skip bots, the server owner, existing nicknames (unless forced) and already-prefixed nicknames
+        if (member.user.bot || member.id === guild.ownerId || (!options.forceMode && member.nickname) ||
+            (member.nickname && member.nickname.startsWith(CONFIG.AUTO_NICKNAME_PREFIX))) {
           skipped++;
           continue;
         }
+        memberIds.push(member.id);
+      }
+      return { memberIds, skipped };
+    },
+    route: '/guilds/:id/members/:id',
+    async apply(member) {
+      await member.setNickname(CONFIG.DEFAULT_NICKNAME_FORMAT(member.user.username));
+    },
+    summary: (job) => `Updated ${job.counts.updated} nicknames (${job.options.forceMode ? 'Force Mode' : 'Normal Mode'})`,
+  },
+
+  roleAdd: {
+    title: 'Bulk Role Add',
+    logAction: 'BULK ROLE ADD',
+    describe: (job) => `**Role:** <@&${job.options.roleId}> (adding)`,
+    async plan(guild, options) {
+      const memberIds = [];
+      let skipped = 0;
+      for (const member of guild.members.cache.values()) {
+        if (member.roles.cache.has(options.roleId)) skipped++;
+        else memberIds.push(member.id);
+      }
+      return { memberIds, skipped };
+    },
+    route: '/guilds/:id/members/:id/roles/:id',
+    async apply(member, options) {
+      await member.roles.add(options.roleId);
+    },
+    summary: (job) => `Added role ${job.options.roleName} to ${job.counts.updated} members`,
+  },
+
+  roleRemove: {
+    title: 'Bulk Role Remove',
+    logAction: 'BULK ROLE REMOVE',
+    describe: (job) => `**Role:** <@&${job.options.roleId}> (removing)`,
+    async plan(guild, options) {
+      const memberIds = [];
+      let skipped = 0;
+      for (const member of guild.members.cache.values()) {
+        if (member.roles.cache.has(options.roleId)) memberIds.push(member.id);
+        else skipped++;
+      }
+      return { memberIds, skipped };
+    },
+    route: '/guilds/:id/members/:id/roles/:id',
+    async apply(member, options) {
+      await member.roles.remove(options.roleId);
+    },
+    summary: (job) => `Removed role ${job.options.roleName} from ${job.counts.updated} members`,
+  },
+};
 
-        // Skip if member already has nickname and not in force mode
-        if (!forceMode && member.nickname) {
-          skipped++;
-          continue;
-        }
+async function saveBulkJob(job) {
+  const file = path.join(BULK_JOB_DIR, `${job.guildId}.json`);
+  await fs.promises.writeFile(`${file}.tmp`, JSON.stringify(job));
+  await fs.promises.rename(`${file}.tmp`, file);
+}
 
-        // Skip if nickname already has the prefix
-        if (member.nickname && member.nickname.startsWith(CONFIG.AUTO_NICKNAME_PREFIX)) {
-          skipped++;
-          continue;
-        }
+async function removeBulkJob(job) {
+  // A newer job may already own this guild's slot and file
+  if (bulkJobs.get(job.guildId) !== job) return;
+  bulkJobs.delete(job.guildId);
+  await fs.promises.rm(path.join(BULK_JOB_DIR, `${job.guildId}.json`), { force: true });
+}
+
+function buildBulkJobEmbed(job) {
+  const type = BULK_JOB_TYPES[job.type];
+  const total = job.memberIds.length + job.counts.planSkipped;
+  const processed = job.cursor + job.counts.planSkipped;
+  const remaining = job.memberIds.length - job.cursor;
+  const finished = job.state === 'done' || job.state === 'cancelled';
+
+  const titles = {
+    planning: `🔄 ${type.title} Started`,
+    running: `🔄 ${type.title} In Progress`,
+    paused: `⏸️ ${type.title} Paused`,
+    cancelled: `🛑 ${type.title} Cancelled`,
+    done: `✅ ${type.title} Complete!`,
+  };
+
+  const embed = new EmbedBuilder()
+    .setTitle(titles[job.state])
+    .setColor(job.state === 'done' ? 0x2ecc71 : job.state === 'cancelled' ? 0xe74c3c : 0xf39c12)
+    .setDescription(type.describe(job))
+    .addFields(
+      { name: '📊 Progress', value: `${processed}/${total} members processed`, inline: true },
+      { name: '✅ Updated', value: `${job.counts.updated}`, inline: true },
+      { name: '⏭️ Skipped', value: `${job.counts.skipped + job.counts.planSkipped}`, inline: true },
+      { name: '❌ Failed', value: `${job.counts.failed}`, inline: true },
+      finished
+        ? { name: '⏱️ Time Taken', value: `~${Math.ceil((Date.now() - job.startedAt) / 60000)} minutes`, inline: false }
+        : { name: '⏱️ Estimated Time', value: `~${Math.ceil(remaining / 60)} minutes remaining`, inline: false }
+    )
+    .setFooter({ text: `Requested by ${job.requestedBy.tag}` })
+    .setTimestamp();
+
+  return embed;
+}
+
+async function finishBulkJob(job, guild, statusMessage) {
+  // The job is already done or cancelled; a failed report must not revive it,
+  // and the slot is released last so nothing can claim it mid-report
+  const type = BULK_JOB_TYPES[job.type];
+  try {
+    if (statusMessage) {
+      await statusMessage.edit({ embeds: [buildBulkJobEmbed(job)] }).catch(() => {});
+    }
+
+    const requester = await client.users.fetch(job.requestedBy.id).catch(() => null);
+    if (guild && requester) {
+      await logModeration(guild, job.state === 'cancelled' ? `${type.logAction} (CANCELLED)` : type.logAction, requester, requester,
+        type.summary(job), [
+          { name: '✅ Updated', value: `${job.counts.updated}`, inline: true },
+          { name: '⏭️ Skipped', value: `${job.counts.skipped + job.counts.planSkipped}`, inline: true },
+          { name: '❌ Failed', value: `${job.counts.failed}`, inline: true }
+        ]);
+    }
+  } catch (error) {
+    console.error(`Failed to log bulk ${job.type} job:`, error);
+  } finally {
+    await removeBulkJob(job).catch(error => console.error(`Failed to remove bulk ${job.type} job:`, error));
+  }
+}
+
+async function fetchBulkJobStatusMessage(job) {
+  // Null while the job is still sending its first status message
+  if (job.statusMessageId == null) return null;
+  const channel = await client.channels.fetch(job.channelId).catch(() => null);
+  return channel ? channel.messages.fetch(job.statusMessageId).catch(() => null) : null;
+}
+
+async function runBulkJob(job) {
+  if (runningBulkJobs.has(job.guildId)) return;
+  runningBulkJobs.add(job.guildId);
+
+  const type = BULK_JOB_TYPES[job.type];
+  const guild = client.guilds.cache.get(job.guildId);
+  const statusMessage = await fetchBulkJobStatusMessage(job);
+
+  try {
+    if (!guild) {
+      throw new Error('Guild is no longer available');
+    }
+    // After a restart the member cache starts out empty
+    if (guild.members.cache.size < guild.memberCount) {
+      await guild.members.fetch();
+    }
+
+    let lastUpdate = Date.now();
+    let lastCheckpoint = Date.now();
+
+    while (job.state === 'running' && job.cursor < job.memberIds.length) {
+      const member = guild.members.cache.get(job.memberIds[job.cursor]);
 
+      if (!member) {
+        // Left the server since the job was planned
+        job.counts.skipped++;
+      } else {
         try {
-          const newNickname = CONFIG.DEFAULT_NICKNAME_FORMAT(member.user.username);
-          await member.setNickname(newNickname);
-          updated++;
+          await laneRequest('bulk', () => type.apply(member, job.options), restBucket(guild.id, type.route));
+          job.counts.updated++;
 
           // Rate limiting: wait 1 second between updates
           await new Promise(resolve => setTimeout(resolve, 1000));
-
-          // Update status message every 5 seconds or every 50 members
-          if (Date.now() - lastUpdate > 5000 || processed % 50 === 0) {
-            const progressEmbed = new EmbedBuilder()
-              .setTitle('🔄 Bulk Nickname Update In Progress')
-              .setColor(0xf39c12)
-              .setDescription(forceMode 
-                ? '**Mode:** Force (overwrites all nicknames)'
-                : '**Mode:** Normal (only users without nicknames)')
-              .addFields(
-                { name: '📊 Progress', value: `${processed}/${total} members processed`, inline: true },
-                { name: '✅ Updated', value: `${updated}`, inline: true },
-                { name: '⏭️ Skipped', value: `${skipped}`, inline: true },
-                { name: '❌ Failed', value: `${failed}`, inline: true },
-                { name: '⏱️ Estimated Time', value: `~${Math.ceil((total - processed) / 60)} minutes remaining`, inline: false }
-              )
-              .setTimestamp();
-
-            await statusMessage.edit({ embeds: [progressEmbed] });
-            lastUpdate = Date.now();
-          }
-
         } catch (error) {
-          failed++;
-          console.log(`Failed to set nickname for ${member.user.tag}:`, error.message);
+          job.counts.failed++;
+          console.log(`Bulk ${job.type} failed for ${member.user.tag}:`, error.message);
         }
       }
+      job.cursor++;
 
-      // Final summary
-      const summaryEmbed = new EmbedBuilder()
-        .setTitle('✅ Bulk Nickname Update Complete!')
-        .setColor(0x2ecc71)
-        .setDescription(forceMode 
-          ? '**Mode:** Force (overwrites all nicknames)'
-          : '**Mode:** Normal (only users without nicknames)')
-        .addFields(
-          { name: '📊 Total Members', value: `${total}`, inline: true },
-          { name: '✅ Successfully Updated', value: `${updated}`, inline: true },
-          { name: '⏭️ Skipped', value: `${skipped}`, inline: true },
-          { name: '❌ Failed', value: `${failed}`, inline: true },
-          { name: '⏱️ Time Taken', value: `~${Math.ceil(updated / 60)} minutes`, inline: false }
-        )
-        .setFooter({ text: `Requested by ${message.author.tag}` })
-        .setTimestamp();
+      // Update status message every 5 seconds or every 50 members
+      if (statusMessage && (Date.now() - lastUpdate > 5000 || job.cursor % 50 === 0)) {
+        await laneRequest('replies', () => statusMessage.edit({ embeds: [buildBulkJobEmbed(job)] }), restBucket(job.channelId, '/channels/:id/messages/:id')).catch(() => {});
+        lastUpdate = Date.now();
+      }
 
-      await statusMessage.edit({ embeds: [summaryEmbed] });
+      if (Date.now() - lastCheckpoint > 5000) {
+        await saveBulkJob(job);
+        lastCheckpoint = Date.now();
+      }
+    }
 
-      // Log the bulk action
-      await logModeration(message.guild, 'BULK NICKNAME UPDATE', message.author, message.author, 
-        `Updated ${updated} nicknames (${forceMode ? 'Force Mode' : 'Normal Mode'})`, [
-          { name: '✅ Updated', value: `${updated}`, inline: true },
-          { name: '⏭️ Skipped', value: `${skipped}`, inline: true },
-          { name: '❌ Failed', value: `${failed}`, inline: true }
-        ]);
+    if (job.state === 'paused') {
+      await saveBulkJob(job);
+      if (statusMessage) await statusMessage.edit({ embeds: [buildBulkJobEmbed(job)] }).catch(() => {});
+      return;
+    }
 
-    } catch (error) {
-      console.error('Error in bulk nickname update:', error);
-      
+    if (job.state === 'running') job.state = 'done';
+    await finishBulkJob(job, guild, statusMessage);
+
+  } catch (error) {
+    console.error(`Error in bulk ${job.type} job:`, error);
+
+    // Cancelled while the failing call was in flight: finish rather than pause
+    if (job.state === 'cancelled') {
+      await finishBulkJob(job, guild, statusMessage);
+      return;
+    }
+
+    // Keep the checkpoint so the job can be resumed once the problem is fixed
+    job.state = 'paused';
+    await saveBulkJob(job).catch(() => {});
+    if (statusMessage) {
       const errorEmbed = new EmbedBuilder()
-        .setTitle('❌ Bulk Nickname Update Failed')
+        .setTitle(`❌ ${type.title} Failed`)
         .setColor(0xe74c3c)
-        .setDescription(`An error occurred: ${error.message}`)
+        .setDescription(`An error occurred: ${error.message}\nThe job is paused; use \`${CONFIG.COMMAND_PREFIX}job resume\` to retry.`)
         .setTimestamp();
+      await statusMessage.edit({ embeds: [errorEmbed] }).catch(() => {});
+    }
+  } finally {
+    runningBulkJobs.delete(job.guildId);
+    // Resumed while this runner was still winding down from a pause
+    if (job.state === 'running' && bulkJobs.get(job.guildId) === job) {
+      runBulkJob(job);
+    }
+  }
+}
+
+async function startBulkJob(message, jobType, options) {
+  const type = BULK_JOB_TYPES[jobType];
+  const existing = bulkJobs.get(message.guild.id);
+  if (existing) {
+    return message.reply(`❌ A ${BULK_JOB_TYPES[existing.type].title.toLowerCase()} is already ${existing.state} in this server. Use \`${CONFIG.COMMAND_PREFIX}job status\` to check it.`);
+  }
+
+  const job = {
+    type: jobType,
+    guildId: message.guild.id,
+    channelId: message.channel.id,
+    statusMessageId: null,
+    requestedBy: { id: message.author.id, tag: message.author.tag },
+    options,
+    memberIds: [],
+    cursor: 0,
+    counts: { updated: 0, skipped: 0, failed: 0, planSkipped: 0 },
+    state: 'planning',
+    startedAt: Date.now(),
+  };
+  // Claim the guild before the first await so two admins can't both start a job
+  bulkJobs.set(job.guildId, job);
+
+  let statusMessage = null;
+  try {
+    // Send initial message
+    const initialEmbed = new EmbedBuilder()
+      .setTitle(`🔄 ${type.title} Started`)
+      .setColor(0xf39c12)
+      .setDescription(`${type.describe(job)}\n**Status:** Fetching members...`)
+      .setTimestamp();
+
+    statusMessage = await message.channel.send({ embeds: [initialEmbed] });
+    job.statusMessageId = statusMessage.id;
+
+    // Fetch all members
+    await message.guild.members.fetch();
+    const plan = await type.plan(message.guild, options);
+    job.memberIds = plan.memberIds;
+    job.counts.planSkipped = plan.skipped;
+
+    // Cancelled (and already finished by !job cancel) while members were being fetched
+    if (job.state !== 'planning' || bulkJobs.get(job.guildId) !== job) {
+      // The cancel may have landed before there was a status message to update
+      await statusMessage.edit({ embeds: [buildBulkJobEmbed(job)] }).catch(() => {});
+      return;
+    }
+
+    job.state = 'running';
+    await saveBulkJob(job);
+  } catch (error) {
+    console.error(`Error planning bulk ${jobType} job:`, error);
+    // A cancel finishes the job itself; otherwise release the slot (and any half-written file)
+    if (job.state === 'cancelled' || bulkJobs.get(job.guildId) !== job) return;
+    await removeBulkJob(job).catch(() => {});
+    if (!statusMessage) return;
+
+    const errorEmbed = new EmbedBuilder()
+      .setTitle(`❌ ${type.title} Failed`)
+      .setColor(0xe74c3c)
+      .setDescription(`An error occurred: ${error.message}`)
+      .setTimestamp();
+
+    return statusMessage.edit({ embeds: [errorEmbed] });
+  }
+
+  await runBulkJob(job);
+}
+
+async function loadBulkJobs() {
+  await fs.promises.mkdir(BULK_JOB_DIR, { recursive: true });
+  for (const file of await fs.promises.readdir(BULK_JOB_DIR)) {
+    if (!file.endsWith('.json')) continue;
+    try {
+      const job = JSON.parse(await fs.promises.readFile(path.join(BULK_JOB_DIR, file), 'utf8'));
+      bulkJobs.set(job.guildId, job);
+      if (job.state === 'running') {
+        console.log(`♻️ Resuming bulk ${job.type} job in guild ${job.guildId} at ${job.cursor}/${job.memberIds.length}`);
+        runBulkJob(job);
+      }
+    } catch (error) {
+      console.error(`Failed to load bulk job ${file}:`, error);
+    }
+  }
+}
 
-      await statusMessage.edit({ embeds: [errorEmbed] });
+// ============ BULK NICKNAME COMMAND ============
+client.on('messageCreate', async message => {
+  if (isCommand(message, 'nicknameall')) {
+    if (message.author.bot) return;
+    
+    // Check for Administrator permission
+    if (!message.member.permissions.has(PermissionFlagsBits.Administrator)) {
+      return message.reply('❌ You need Administrator permission to use this command.');
     }
+
+    const args = message.content.split(' ');
+    const forceMode = args.includes('force');
+
+    await startBulkJob(message, 'nickname', { forceMode });
+  }
+});
+
+// ============ BULK ROLE COMMAND ============
+client.on('messageCreate', async message => {
+  if (isCommand(message, 'roleall')) {
+    if (message.author.bot) return;
+
+    // Check for Administrator permission
+    if (!message.member.permissions.has(PermissionFlagsBits.Administrator)) {
+      return message.reply('❌ You need Administrator permission to use this command.');
+    }
+
+    const args = message.content.split(/ +/).slice(1);
+    const removeMode = args[0] === 'remove';
+    const roleQuery = (removeMode ? args.slice(1) : args).join(' ').toLowerCase();
+    const role = message.mentions.roles.first() ||
+      message.guild.roles.cache.get(roleQuery) ||
+      message.guild.roles.cache.find(r => r.name.toLowerCase() === roleQuery);
+
+    if (!role) {
+      return message.reply(`❌ Please provide a role, e.g. \`${CONFIG.COMMAND_PREFIX}roleall @Role\` or \`${CONFIG.COMMAND_PREFIX}roleall remove @Role\`.`);
+    }
+
+    if (role.managed || role.id === message.guild.id || !role.editable) {
+      return message.reply('❌ I cannot assign this role.');
+    }
+
+    await startBulkJob(message, removeMode ? 'roleRemove' : 'roleAdd', { roleId: role.id, roleName: role.name });
+  }
+});
+
+// ============ JOB CONTROL COMMAND ============
+client.on('messageCreate', async message => {
+  if (isCommand(message, 'job')) {
+    if (message.author.bot) return;
+
+    // Check for Administrator permission
+    if (!message.member.permissions.has(PermissionFlagsBits.Administrator)) {
+      return message.reply('❌ You need Administrator permission to use this command.');
+    }
+
+    const action = message.content.split(/ +/)[1] || 'status';
+    const job = bulkJobs.get(message.guild.id);
+
+    if (!job) {
+      return message.reply('✅ No bulk job is running in this server.');
+    }
+
+    if (action === 'status') {
+      return message.channel.send({ embeds: [buildBulkJobEmbed(job)] });
+    }
+
+    if (action === 'pause') {
+      if (job.state === 'planning') return message.reply('❌ The job is still fetching members; wait for it to start or cancel it.');
+      if (job.state !== 'running') return message.reply('❌ The job is not running.');
+      job.state = 'paused';
+      if (!runningBulkJobs.has(job.guildId)) await saveBulkJob(job);
+      return message.reply('⏸️ Job paused. It will stop after the current member.');
+    }
+
+    if (action === 'resume') {
+      if (job.state !== 'paused') return message.reply('❌ The job is not paused.');
+      job.state = 'running';
+      message.reply('▶️ Job resumed.');
+      // If the runner hasn't noticed the pause yet it just carries on
+      return runBulkJob(job);
+    }
+
+    if (action === 'cancel') {
+      if (job.state === 'done' || job.state === 'cancelled') return message.reply('❌ The job is already finishing.');
+      job.state = 'cancelled';
+      message.reply('🛑 Job cancelled.');
+      // A live runner finishes the job itself once it sees the new state
+      if (!runningBulkJobs.has(job.guildId)) {
+        await finishBulkJob(job, message.guild, await fetchBulkJobStatusMessage(job));
+      }
+      return;
+    }
+
+    message.reply(`❌ Usage: \`${CONFIG.COMMAND_PREFIX}job status|pause|resume|cancel\``);
   }
 });
 
@@ -829,9 +2518,7 @@ client.on('interactionCreate', async interaction => {
 
     activeTickets.delete(interaction.channelId);
 
-    setTimeout(async () => {
-      await interaction.channel.delete();
-    }, 5000);
+    scheduleTask('deleteChannel', 5000, { channelId: interaction.channelId });
   }
 });
 